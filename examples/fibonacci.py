@@ -1,17 +1,29 @@
 # Fibonacci Sequence in Python for Vib-OS
 # Run with: run fibonacci.py
 
+from itertools import islice
+
+def fib_pair(n):
+    """Return (F(n), F(n+1)) using fast doubling"""
+    if n == 0:
+        return (0, 1)
+    a, b = fib_pair(n >> 1)
+    c = a * (2 * b - a)
+    d = a * a + b * b
+    if n & 1 == 0:
+        return (c, d)
+    return (d, c + d)
+
 def fibonacci(n):
     """Generate first n Fibonacci numbers"""
-    if n <= 0:
-        return []
-    elif n == 1:
-        return [0]
-    
-    fib = [0, 1]
-    for i in range(2, n):
-        fib.append(fib[i-1] + fib[i-2])
-    return fib
+    def gen():
+        a, b = 0, 1
+        yield a
+        yield b
+        while True:
+            a, b = b, a + b
+            yield b
+    return list(islice(gen(), max(n, 0)))
 
 def main():
     print("Fibonacci Sequence Generator")
@@ -2,19 +2,38 @@
 """
 Convert toolbar PNG icons to C arrays for vib-OS kernel.
 Icons should be 24x24 RGBA PNGs in the same directory.
+Pass --install-deps to pip-install Pillow and NumPy if they are missing.
 """
 
+import functools
+import importlib
+import io
 import os
 import sys
 
-try:
-    from PIL import Image
-except ImportError:
-    print("PIL not found. Installing...")
-    os.system("pip3 install pillow")
-    from PIL import Image
+# Pillow and NumPy are imported by _ensure_deps() on first use
+Image = ImageDraw = np = None
 
 ICON_SIZE = 24
+WHITE = (255, 255, 255, 255)
+
+def _require(module, package, install_deps):
+    """Import a module, pip-installing its package if allowed"""
+    try:
+        return importlib.import_module(module)
+    except ImportError:
+        if not install_deps:
+            sys.exit(f"{package} not found. Re-run with --install-deps or: pip3 install {package}")
+        print(f"{package} not found. Installing...", file=sys.stderr)
+        os.system(f"pip3 install {package}")
+        return importlib.import_module(module)
+
+def _ensure_deps(install_deps=False):
+    """Import Pillow and NumPy for rendering and packing icons"""
+    global Image, ImageDraw, np
+    Image = _require("PIL.Image", "pillow", install_deps)
+    ImageDraw = _require("PIL.ImageDraw", "pillow", install_deps)
+    np = _require("numpy", "numpy", install_deps)
 
 # Icon names for toolbar
 ICONS = [
@@ -30,116 +49,148 @@ ICONS = [
 
 def render_chevron_left(size):
     """Generate left chevron icon programmatically"""
-    from PIL import ImageDraw
     img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
     draw = ImageDraw.Draw(img)
     # Draw anti-aliased chevron
     cx, cy = size // 2, size // 2
     points = [(cx + 4, cy - 7), (cx - 4, cy), (cx + 4, cy + 7)]
-    draw.line(points, fill=(255, 255, 255, 255), width=3)
+    draw.line(points, fill=WHITE, width=3)
     return img
 
 def render_chevron_right(size):
     """Generate right chevron icon programmatically"""
-    from PIL import ImageDraw
     img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
     draw = ImageDraw.Draw(img)
     cx, cy = size // 2, size // 2
     points = [(cx - 4, cy - 7), (cx + 4, cy), (cx - 4, cy + 7)]
-    draw.line(points, fill=(255, 255, 255, 255), width=3)
+    draw.line(points, fill=WHITE, width=3)
     return img
 
 def render_rotate_cw(size):
     """Generate clockwise rotation icon"""
-    from PIL import ImageDraw
     img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
     draw = ImageDraw.Draw(img)
     # Draw arc
-    draw.arc([4, 4, size-4, size-4], 45, 315, fill=(255, 255, 255, 255), width=2)
+    draw.arc([4, 4, size-4, size-4], 45, 315, fill=WHITE, width=2)
     # Arrow head at end of arc
-    draw.polygon([(size-6, 6), (size-3, 10), (size-10, 8)], fill=(255, 255, 255, 255))
+    draw.polygon([(size-6, 6), (size-3, 10), (size-10, 8)], fill=WHITE)
     return img
 
 def render_rotate_ccw(size):
     """Generate counter-clockwise rotation icon"""
-    from PIL import ImageDraw
     img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
     draw = ImageDraw.Draw(img)
     # Draw arc
-    draw.arc([4, 4, size-4, size-4], 225, 495, fill=(255, 255, 255, 255), width=2)
+    draw.arc([4, 4, size-4, size-4], 225, 495, fill=WHITE, width=2)
     # Arrow head
-    draw.polygon([(6, 6), (10, 3), (8, 10)], fill=(255, 255, 255, 255))
+    draw.polygon([(6, 6), (10, 3), (8, 10)], fill=WHITE)
     return img
 
 def render_zoom_in(size):
     """Generate zoom in (+) icon"""
-    from PIL import ImageDraw
     img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
     draw = ImageDraw.Draw(img)
     cx, cy = size // 2, size // 2
     # Plus sign
-    draw.line([(cx - 6, cy), (cx + 6, cy)], fill=(255, 255, 255, 255), width=3)
-    draw.line([(cx, cy - 6), (cx, cy + 6)], fill=(255, 255, 255, 255), width=3)
+    draw.line([(cx - 6, cy), (cx + 6, cy)], fill=WHITE, width=3)
+    draw.line([(cx, cy - 6), (cx, cy + 6)], fill=WHITE, width=3)
     return img
 
 def render_zoom_out(size):
     """Generate zoom out (-) icon"""
-    from PIL import ImageDraw
     img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
     draw = ImageDraw.Draw(img)
     cx, cy = size // 2, size // 2
     # Minus sign
-    draw.line([(cx - 6, cy), (cx + 6, cy)], fill=(255, 255, 255, 255), width=3)
+    draw.line([(cx - 6, cy), (cx + 6, cy)], fill=WHITE, width=3)
     return img
 
 def render_fit(size):
     """Generate fit-to-window icon (box with corners)"""
-    from PIL import ImageDraw
     img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
     draw = ImageDraw.Draw(img)
     # Box outline
-    draw.rectangle([4, 4, size-5, size-5], outline=(255, 255, 255, 255), width=2)
+    draw.rectangle([4, 4, size-5, size-5], outline=WHITE, width=2)
     # Diagonal arrows pointing inward
-    draw.line([(4, 4), (10, 10)], fill=(255, 255, 255, 255), width=2)
-    draw.line([(size-5, size-5), (size-11, size-11)], fill=(255, 255, 255, 255), width=2)
+    draw.line([(4, 4), (10, 10)], fill=WHITE, width=2)
+    draw.line([(size-5, size-5), (size-11, size-11)], fill=WHITE, width=2)
     return img
 
 def render_fullscreen(size):
     """Generate fullscreen icon (4 corners)"""
-    from PIL import ImageDraw
     img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
     draw = ImageDraw.Draw(img)
     # Top-left corner
-    draw.line([(2, 8), (2, 2), (8, 2)], fill=(255, 255, 255, 255), width=2)
+    draw.line([(2, 8), (2, 2), (8, 2)], fill=WHITE, width=2)
     # Top-right corner
-    draw.line([(size-9, 2), (size-3, 2), (size-3, 8)], fill=(255, 255, 255, 255), width=2)
+    draw.line([(size-9, 2), (size-3, 2), (size-3, 8)], fill=WHITE, width=2)
     # Bottom-left corner
-    draw.line([(2, size-9), (2, size-3), (8, size-3)], fill=(255, 255, 255, 255), width=2)
+    draw.line([(2, size-9), (2, size-3), (8, size-3)], fill=WHITE, width=2)
     # Bottom-right corner
-    draw.line([(size-9, size-3), (size-3, size-3), (size-3, size-9)], fill=(255, 255, 255, 255), width=2)
+    draw.line([(size-9, size-3), (size-3, size-3), (size-3, size-9)], fill=WHITE, width=2)
     return img
 
-def image_to_c_array(img, name):
-    """Convert PIL image to C array of RGBA values"""
-    img = img.convert('RGBA')
-    pixels = list(img.getdata())
-    
-    lines = [f"/* {name} - {img.width}x{img.height} RGBA icon */"]
-    lines.append(f"static const uint32_t {name}[{img.width * img.height}] = {{")
+def pack_argb(rgba):
+    """Pack an (..., 4) RGBA uint8 array into 0xAARRGGBB uint32 values"""
+    # View each RGBA quad in place as a little-endian 0xAABBGGRR word and
+    # swap the R and B bytes, rather than widening every channel to uint32
+    rgba = np.ascontiguousarray(rgba, dtype=np.uint8)
+    abgr = rgba.view('<u4')[..., 0]
+    return (abgr & 0xFF00FF00) | ((abgr >> 16) & 0xFF) | ((abgr & 0xFF) << 16)
+
+# Below this many pixels, loading the compiled Numba kernel costs more than
+# packing with NumPy, so the kernel is only used for very large batches
+NUMBA_MIN_PIXELS = 1 << 26
+
+@functools.lru_cache(maxsize=None)
+def _numba_pack_kernel():
+    """Build the optional Numba packing kernel, or None without numba"""
+    try:
+        import numpy
+        from numba import njit, prange
+    except ImportError:
+        return None
+
+    @njit(parallel=True, cache=True)
+    def pack_argb_kernel(rgba, out):
+        """Pack (N, P, 4) RGBA bytes into (N, P) ARGB words"""
+        for n in prange(rgba.shape[0]):
+            for i in range(rgba.shape[1]):
+                r = numpy.uint32(rgba[n, i, 0])
+                g = numpy.uint32(rgba[n, i, 1])
+                b = numpy.uint32(rgba[n, i, 2])
+                a = numpy.uint32(rgba[n, i, 3])
+                out[n, i] = (a << 24) | (r << 16) | (g << 8) | b
+
+    return pack_argb_kernel
+
+def pack_icons(images):
+    """Pack same-sized images into an (N, W*H) array of ARGB pixels"""
+    stack = np.stack([np.asarray(img.convert('RGBA')) for img in images])
+    kernel = _numba_pack_kernel() if stack.size // 4 >= NUMBA_MIN_PIXELS else None
+    if kernel is None:
+        return pack_argb(stack).reshape(len(images), -1)
     
-    for y in range(img.height):
-        row = []
-        for x in range(img.width):
-            r, g, b, a = pixels[y * img.width + x]
-            # Pack as ARGB: 0xAARRGGBB
-            pixel = (a << 24) | (r << 16) | (g << 8) | b
-            row.append(f"0x{pixel:08X}")
-        lines.append("    " + ", ".join(row) + ",")
+    rgba = stack.reshape(len(images), -1, 4)
+    out = np.empty(rgba.shape[:2], dtype=np.uint32)
+    kernel(rgba, out)
+    return out
+
+def argb_to_c_array(packed, width, height, name):
+    """Format a flat array of ARGB pixels as a C array"""
+    # Serialize big-endian so each 4-byte group hex-encodes as AARRGGBB;
+    # bytes.hex() then splits the groups itself, one C-level call per row
+    raw = np.asarray(packed, dtype='>u4').tobytes()
+    stride = width * 4
     
-    lines.append("};")
-    return "\n".join(lines)
+    header = f"/* {name} - {width}x{height} RGBA icon */"
+    decl = f"static const uint32_t {name}[{width * height}] = {{"
+    rows = ["    0x" + raw[row:row + stride].hex(" ", 4).upper().replace(" ", ", 0x") + ","
+            for row in range(0, height * stride, stride)]
+    return "\n".join([header, decl, *rows, "};"])
 
 def main():
+    _ensure_deps(install_deps="--install-deps" in sys.argv[1:])
     size = ICON_SIZE
     
     # Generate icons programmatically
@@ -155,43 +206,44 @@ def main():
     ]
     
     # Generate C header
-    output = []
-    output.append("/*")
-    output.append(" * Toolbar Icons for vib-OS Image Viewer")
-    output.append(" * Auto-generated 24x24 RGBA icons")
-    output.append(" */")
-    output.append("")
-    output.append("#ifndef TOOLBAR_ICONS_H")
-    output.append("#define TOOLBAR_ICONS_H")
-    output.append("")
-    output.append("#include \"types.h\"")
-    output.append("")
-    output.append(f"#define TOOLBAR_ICON_SIZE {size}")
-    output.append("")
+    buf = io.StringIO()
+    buf.write("/*\n")
+    buf.write(" * Toolbar Icons for vib-OS Image Viewer\n")
+    buf.write(" * Auto-generated 24x24 RGBA icons\n")
+    buf.write(" */\n")
+    buf.write("\n")
+    buf.write("#ifndef TOOLBAR_ICONS_H\n")
+    buf.write("#define TOOLBAR_ICONS_H\n")
+    buf.write("\n")
+    buf.write("#include \"types.h\"\n")
+    buf.write("\n")
+    buf.write(f"#define TOOLBAR_ICON_SIZE {size}\n")
+    buf.write("\n")
     
-    for name, img in icons:
-        output.append(image_to_c_array(img, name))
-        output.append("")
+    packed = pack_icons([img for _, img in icons])
+    for (name, img), pixels in zip(icons, packed):
+        buf.write(argb_to_c_array(pixels, img.width, img.height, name))
+        buf.write("\n\n")
     
     # Array of pointers for easy access
-    output.append("/* Icon array for toolbar */")
-    output.append("static const uint32_t* toolbar_icons[] = {")
+    buf.write("/* Icon array for toolbar */\n")
+    buf.write("static const uint32_t* toolbar_icons[] = {\n")
     for name, _ in icons:
-        output.append(f"    {name},")
-    output.append("};")
-    output.append("")
-    output.append("#define TOOLBAR_ICON_PREV 0")
-    output.append("#define TOOLBAR_ICON_NEXT 1")
-    output.append("#define TOOLBAR_ICON_ROTATE_CW 2")
-    output.append("#define TOOLBAR_ICON_ROTATE_CCW 3")
-    output.append("#define TOOLBAR_ICON_ZOOM_IN 4")
-    output.append("#define TOOLBAR_ICON_ZOOM_OUT 5")
-    output.append("#define TOOLBAR_ICON_FIT 6")
-    output.append("#define TOOLBAR_ICON_FULLSCREEN 7")
-    output.append("")
-    output.append("#endif /* TOOLBAR_ICONS_H */")
+        buf.write(f"    {name},\n")
+    buf.write("};\n")
+    buf.write("\n")
+    buf.write("#define TOOLBAR_ICON_PREV 0\n")
+    buf.write("#define TOOLBAR_ICON_NEXT 1\n")
+    buf.write("#define TOOLBAR_ICON_ROTATE_CW 2\n")
+    buf.write("#define TOOLBAR_ICON_ROTATE_CCW 3\n")
+    buf.write("#define TOOLBAR_ICON_ZOOM_IN 4\n")
+    buf.write("#define TOOLBAR_ICON_ZOOM_OUT 5\n")
+    buf.write("#define TOOLBAR_ICON_FIT 6\n")
+    buf.write("#define TOOLBAR_ICON_FULLSCREEN 7\n")
+    buf.write("\n")
+    buf.write("#endif /* TOOLBAR_ICONS_H */")
     
-    print("\n".join(output))
+    print(buf.getvalue())
 
 if __name__ == "__main__":
     main()
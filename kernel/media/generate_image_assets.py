@@ -5,6 +5,8 @@ Generate C header files from image assets
 import os
 import sys
 
+_hexfmt = "0x%02x".__mod__
+
 def generate_header(input_file, output_file, var_name):
     """Convert image file to C header - just data, no header guards"""
     with open(input_file, 'rb') as f:
@@ -17,7 +19,7 @@ def generate_header(input_file, output_file, var_name):
         # Write bytes in rows of 16
         for i in range(0, len(data), 16):
             chunk = data[i:i+16]
-            hex_str = ', '.join(f'0x{b:02x}' for b in chunk)
+            hex_str = ', '.join(map(_hexfmt, chunk))
             f.write(f"    {hex_str},\n")
         
         f.write("};\n\n")
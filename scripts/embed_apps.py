@@ -2,6 +2,8 @@
 import os
 import sys
 
+_hexfmt = "0x%02x,".__mod__
+
 def embed_file(name, path, out_c, out_h):
     try:
         with open(path, "rb") as f:
@@ -13,9 +15,10 @@ def embed_file(name, path, out_c, out_h):
     out_c.write(f"/* {name} ({len(data)} bytes) */\n")
     out_c.write(f"const unsigned char {name}[] = {{\n")
     
-    for i, byte in enumerate(data):
-        out_c.write(f"0x{byte:02x},")
-        if (i + 1) % 16 == 0:
+    for i in range(0, len(data), 16):
+        chunk = data[i:i+16]
+        out_c.write("".join(map(_hexfmt, chunk)))
+        if len(chunk) == 16:
             out_c.write("\n")
             
     out_c.write("\n};\n")